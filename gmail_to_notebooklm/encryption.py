@@ -20,11 +20,17 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 class TokenEncryption:
     """Handles encryption and decryption of OAuth tokens."""
     
-    def __init__(self):
-        """Initialize encryption with system-derived key."""
-        self._fernet = self._create_fernet()
+    def __init__(self, key: Optional[bytes] = None):
+        """
+        Initialize encryption with system-derived key.
+        
+        Args:
+            key: Previously derived Fernet key; skips key derivation if given
+        """
+        self._fernet = self._create_fernet(key)
     
-    def _derive_key(self) -> bytes:
+    @staticmethod
+    def _derive_key() -> bytes:
         """
         Derive encryption key from system information.
         
@@ -54,14 +60,18 @@ class TokenEncryption:
         
         return key
     
-    def _create_fernet(self) -> Fernet:
+    def _create_fernet(self, key: Optional[bytes] = None) -> Fernet:
         """
         Create Fernet cipher with derived key.
         
+        Args:
+            key: Fernet key to use instead of deriving one
+            
         Returns:
             Fernet: Initialized Fernet cipher
         """
-        key = self._derive_key()
+        if key is None:
+            key = self._derive_key()
         return Fernet(key)
     
     def encrypt(self, data: bytes) -> bytes:
@@ -5,9 +5,10 @@ This module provides client-side rate limiting to prevent exceeding
 Gmail API quotas and handle rate limit errors gracefully.
 """
 
+import random
 import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Callable, Any
+from typing import Optional, Dict, Callable, Any, List
 from functools import wraps
 import logging
 
@@ -29,7 +30,9 @@ class RateLimiter:
         max_retries: int = 5,
         initial_backoff: float = 1.0,
         max_backoff: float = 60.0,
-        backoff_multiplier: float = 2.0
+        backoff_multiplier: float = 2.0,
+        time_func: Callable[[], float] = time.monotonic,
+        sleep_func: Callable[[float], Any] = time.sleep
     ):
         """
         Initialize rate limiter.
@@ -40,6 +43,8 @@ class RateLimiter:
             initial_backoff: Initial backoff time in seconds
             max_backoff: Maximum backoff time in seconds
             backoff_multiplier: Multiplier for exponential backoff
+            time_func: Monotonic clock used for throttling and rate limit expiry
+            sleep_func: Function used to block for a number of seconds
         """
         self.requests_per_second = requests_per_second
         self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0
@@ -47,43 +52,53 @@ class RateLimiter:
         self.initial_backoff = initial_backoff
         self.max_backoff = max_backoff
         self.backoff_multiplier = backoff_multiplier
+        self._now = time_func
+        self._sleep = sleep_func
         
         # Track last request time per endpoint
         self._last_request_times: Dict[str, float] = {}
         
-        # Track rate limit status
-        self._rate_limited_until: Dict[str, datetime] = {}
+        # Track rate limit status (deadlines on the time_func clock)
+        self._rate_limited_until: Dict[str, float] = {}
     
-    def wait_if_needed(self, endpoint: str = "default"):
+    def wait_if_needed(self, endpoint: str = "default") -> float:
         """
         Wait if necessary to respect rate limit.
         
         Args:
             endpoint: API endpoint identifier
+            
+        Returns:
+            float: Seconds spent waiting
         """
         if self.min_interval == 0:
-            return  # Rate limiting disabled
+            return 0.0  # Rate limiting disabled
+        
+        waited = 0.0
         
         # Check if we're currently rate limited
         if endpoint in self._rate_limited_until:
-            wait_until = self._rate_limited_until[endpoint]
-            if datetime.now() < wait_until:
-                wait_seconds = (wait_until - datetime.now()).total_seconds()
+            wait_seconds = self._rate_limited_until[endpoint] - self._now()
+            if wait_seconds > 0:
                 logger.info(f"Rate limited on {endpoint}, waiting {wait_seconds:.2f}s")
-                time.sleep(wait_seconds)
+                self._sleep(wait_seconds)
+                waited += wait_seconds
             else:
                 # Rate limit period expired
                 del self._rate_limited_until[endpoint]
         
         # Throttle based on requests per second
-        last_request = self._last_request_times.get(endpoint, 0)
-        elapsed = time.time() - last_request
-        
-        if elapsed < self.min_interval:
-            wait_time = self.min_interval - elapsed
-            time.sleep(wait_time)
+        last_request = self._last_request_times.get(endpoint)
+        if last_request is not None:
+            elapsed = self._now() - last_request
+            
+            if elapsed < self.min_interval:
+                wait_time = self.min_interval - elapsed
+                self._sleep(wait_time)
+                waited += wait_time
         
-        self._last_request_times[endpoint] = time.time()
+        self._last_request_times[endpoint] = self._now()
+        return waited
     
     def calculate_backoff(self, retry_count: int, jitter: bool = True) -> float:
         """
@@ -96,19 +111,59 @@ class RateLimiter:
         Returns:
             float: Backoff time in seconds
         """
-        backoff = min(
-            self.initial_backoff * (self.backoff_multiplier ** retry_count),
-            self.max_backoff
-        )
+        backoff = self._base_backoff(retry_count)
         
         # Add jitter (±10%) to prevent thundering herd
         if jitter:
-            import random
             jitter_factor = random.uniform(0.9, 1.1)
             backoff *= jitter_factor
         
         return backoff
     
+    def calculate_backoff_batch(
+        self,
+        retry_count: int,
+        n: int,
+        jitter: bool = True
+    ) -> List[float]:
+        """
+        Calculate several backoff times for the same retry attempt.
+        
+        The capped exponential base is computed once; only the jitter
+        is drawn per sample.
+        
+        Args:
+            retry_count: Current retry attempt (0-indexed)
+            n: Number of backoff times to calculate
+            jitter: Whether to add random jitter
+            
+        Returns:
+            List[float]: Backoff times in seconds
+        """
+        base = self._base_backoff(retry_count)
+        if not jitter:
+            return [base] * n
+        
+        uniform = random.uniform
+        return [base * uniform(0.9, 1.1) for _ in range(n)]
+    
+    def _base_backoff(self, retry_count: int) -> float:
+        """
+        Calculate exponential backoff without jitter, capped at max_backoff.
+        
+        Args:
+            retry_count: Current retry attempt (0-indexed)
+            
+        Returns:
+            float: Backoff time in seconds
+        """
+        if self.backoff_multiplier == 2.0 and retry_count >= 0:
+            # Default doubling schedule: a shift is exact and cheaper than pow
+            growth = 1 << retry_count
+        else:
+            growth = self.backoff_multiplier ** retry_count
+        return min(self.initial_backoff * growth, self.max_backoff)
+    
     def handle_rate_limit_error(
         self,
         endpoint: str,
@@ -121,16 +176,14 @@ class RateLimiter:
             endpoint: API endpoint that was rate limited
             retry_after: Seconds to wait before retry (from API response)
         """
-        if retry_after:
-            wait_until = datetime.now() + timedelta(seconds=retry_after)
-        else:
-            # Default to 60 seconds if not specified
-            wait_until = datetime.now() + timedelta(seconds=60)
+        # Default to 60 seconds if not specified
+        delay = retry_after if retry_after else 60
         
-        self._rate_limited_until[endpoint] = wait_until
+        self._rate_limited_until[endpoint] = self._now() + delay
+        resume_at = datetime.now() + timedelta(seconds=delay)
         logger.warning(
             f"Rate limit hit on {endpoint}, "
-            f"waiting until {wait_until.strftime('%H:%M:%S')}"
+            f"waiting until {resume_at.strftime('%H:%M:%S')}"
         )
     
     def is_rate_limited(self, endpoint: str = "default") -> bool:
@@ -143,15 +196,21 @@ class RateLimiter:
         Returns:
             bool: True if rate limited
         """
-        if endpoint not in self._rate_limited_until:
+        wait_until = self._rate_limited_until.get(endpoint)
+        if wait_until is None:
             return False
         
-        if datetime.now() >= self._rate_limited_until[endpoint]:
+        if self._now() >= wait_until:
             del self._rate_limited_until[endpoint]
             return False
         
         return True
     
+    def reset(self):
+        """Clear per-endpoint throttling and rate limit state."""
+        self._last_request_times.clear()
+        self._rate_limited_until.clear()
+    
     def get_rate_limit_status(self, endpoint: str = "default") -> Dict[str, Any]:
         """
         Get rate limit status for endpoint.
@@ -169,9 +228,10 @@ class RateLimiter:
         }
         
         if endpoint in self._rate_limited_until:
-            wait_until = self._rate_limited_until[endpoint]
-            status['rate_limited_until'] = wait_until.isoformat()
-            status['seconds_remaining'] = (wait_until - datetime.now()).total_seconds()
+            remaining = self._rate_limited_until[endpoint] - self._now()
+            resume_at = datetime.now() + timedelta(seconds=remaining)
+            status['rate_limited_until'] = resume_at.isoformat()
+            status['seconds_remaining'] = remaining
         
         return status
 
@@ -258,7 +318,7 @@ def with_retry(
                         f"Request failed (attempt {attempt + 1}/{retries + 1}) "
                         f"for {endpoint}, retrying in {backoff:.2f}s: {str(e)}"
                     )
-                    time.sleep(backoff)
+                    limiter._sleep(backoff)
             
             # Should never reach here, but just in case
             if last_exception:
@@ -271,16 +331,22 @@ def with_retry(
 class CachedValue:
     """Simple cache with TTL for reducing API calls."""
     
-    def __init__(self, ttl_seconds: int = 3600):
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        time_func: Callable[[], float] = time.monotonic
+    ):
         """
         Initialize cached value.
         
         Args:
             ttl_seconds: Time to live in seconds
+            time_func: Monotonic clock used for expiry
         """
         self.ttl_seconds = ttl_seconds
+        self._now = time_func
         self._value: Optional[Any] = None
-        self._expires_at: Optional[datetime] = None
+        self._expires_at: Optional[float] = None
     
     def get(self) -> Optional[Any]:
         """
@@ -292,7 +358,7 @@ class CachedValue:
         if self._value is None or self._expires_at is None:
             return None
         
-        if datetime.now() >= self._expires_at:
+        if self._now() >= self._expires_at:
             self._value = None
             self._expires_at = None
             return None
@@ -307,7 +373,7 @@ class CachedValue:
             value: Value to cache
         """
         self._value = value
-        self._expires_at = datetime.now() + timedelta(seconds=self.ttl_seconds)
+        self._expires_at = self._now() + self.ttl_seconds
     
     def clear(self):
         """Clear cached value."""
@@ -327,14 +393,19 @@ class CachedValue:
 class LabelCache:
     """Cache for Gmail labels to reduce API calls."""
     
-    def __init__(self, ttl_seconds: int = 3600):
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        time_func: Callable[[], float] = time.monotonic
+    ):
         """
         Initialize label cache.
         
         Args:
             ttl_seconds: Time to live in seconds (default 1 hour)
+            time_func: Monotonic clock used for expiry
         """
-        self._cache = CachedValue(ttl_seconds)
+        self._cache = CachedValue(ttl_seconds, time_func)
     
     def get_labels(self) -> Optional[list]:
         """
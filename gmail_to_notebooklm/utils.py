@@ -1,20 +1,70 @@
 """Utility functions for file operations and text sanitization."""
 
 import re
-from datetime import datetime
+from datetime import date, datetime
 from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from .validation import PathValidator, ValidationError
 from .audit import get_audit_logger
 
+_ANCHOR_UNSAFE = re.compile(r"[^a-z0-9-]")
+_ANGLE_ADDRESS = re.compile(r"<(.+?)>")
+_TIME_FIELD = re.compile(r"(\d\d?):(\d\d)(?::(\d\d))?")
+_ZONE_FIELD = re.compile(r"[+-](?:[01][0-9]|2[0-3])[0-5][0-9]|[A-Za-z]+")
 
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+
+def _parse_email_day(date_str: str) -> date:
+    """
+    Parse the calendar day of an RFC 2822 date header.
+
+    Handles the common "[Day,] DD Mon YYYY HH:MM[:SS] ..." shape directly
+    and falls back to email.utils.parsedate_to_datetime for anything else,
+    so both paths accept and reject the same headers. Like
+    parsedate_to_datetime, the day is taken in the header's own timezone.
+
+    Args:
+        date_str: Date header value
+
+    Returns:
+        date: Calendar day of the message
+
+    Raises:
+        ValueError, TypeError: If the date cannot be parsed
+    """
+    try:
+        parts = date_str.split()
+        if parts[0].endswith(","):
+            parts = parts[1:]
+        day, month, year = parts[0], parts[1], parts[2]
+        time = _TIME_FIELD.fullmatch(parts[3])
+        if not (time and day.isdigit() and year.isdigit() and len(year) == 4):
+            raise ValueError("not the common shape")
+        hour, minute, second = (int(field or 0) for field in time.groups())
+        if hour > 23 or minute > 59 or second > 59:
+            raise ValueError("time out of range")
+        if len(parts) > 4 and not _ZONE_FIELD.fullmatch(parts[4]):
+            raise ValueError("unusual zone")
+        return date(int(year), _MONTHS[month.lower()], int(day))
+    except (AttributeError, IndexError, KeyError, ValueError):
+        return parsedate_to_datetime(date_str).date()
+
+
+@lru_cache(maxsize=4096)
 def sanitize_filename(text: str, max_length: int = 200) -> str:
     """
     Sanitize text for use as filename.
 
     Removes or replaces characters that are invalid in filenames.
+    Results are memoized, since exports often repeat subjects such as
+    "Re: [Project]".
 
     Args:
         text: Text to sanitize
@@ -262,11 +312,13 @@ def get_env_or_default(key: str, default: Optional[str] = None) -> Optional[str]
     return os.environ.get(key, default)
 
 
+@lru_cache(maxsize=1024)
 def validate_date(date_str: str) -> str:
     """
     Validate and normalize date string for Gmail query.
 
-    Accepts YYYY-MM-DD or YYYY/MM/DD format.
+    Accepts YYYY-MM-DD or YYYY/MM/DD format. Valid results are memoized so
+    repeated filters skip strptime; invalid dates raise every time.
 
     Args:
         date_str: Date string to validate
@@ -435,10 +487,7 @@ def generate_index_file(
         # Parse and format date if possible
         try:
             # Try to parse date string and format as YYYY-MM-DD
-            from email.utils import parsedate_to_datetime
-
-            date_obj = parsedate_to_datetime(date_str)
-            date_display = date_obj.strftime("%Y-%m-%d")
+            date_display = _parse_email_day(date_str).isoformat()
         except (ValueError, TypeError, AttributeError):
             date_display = date_str[:10] if len(date_str) > 10 else date_str
 
@@ -498,7 +547,7 @@ def get_date_subdirectory(email_data: dict, date_format: str = "YYYY/MM") -> str
 
     try:
         # Parse email date
-        date_obj = parsedate_to_datetime(date_str)
+        date_obj = _parse_email_day(date_str)
 
         # Format based on specified format
         if date_format == "YYYY/MM":
@@ -561,7 +610,7 @@ def generate_anchor_id(
         anchor = f"email-{short_id}".lower()
 
     # Ensure only alphanumeric and hyphens
-    anchor = re.sub(r"[^a-z0-9-]", "", anchor)
+    anchor = _ANCHOR_UNSAFE.sub("", anchor)
 
     # Remove leading/trailing hyphens
     anchor = anchor.strip("-")
@@ -613,7 +662,7 @@ def group_emails_by(
         elif group_by == "date":
             # Extract YYYY-MM from date
             try:
-                date_obj = parsedate_to_datetime(email.get("date", ""))
+                date_obj = _parse_email_day(email.get("date", ""))
                 key = f"{date_obj.year}-{date_obj.month:02d}"
             except (ValueError, TypeError, AttributeError):
                 key = "unknown_date"
@@ -621,13 +670,13 @@ def group_emails_by(
             # Extract email address from "From" field
             from_str = email.get("from", "unknown")
             # Try to extract email address from "Name <email@domain>" format
-            match = re.search(r"<(.+?)>", from_str)
+            match = _ANGLE_ADDRESS.search(from_str)
             key = match.group(1) if match else from_str
         elif group_by == "recipient":
             # Extract email address from "To" field
             to_str = email.get("to", "unknown")
             # Try to extract email address from "Name <email@domain>" format
-            match = re.search(r"<(.+?)>", to_str)
+            match = _ANGLE_ADDRESS.search(to_str)
             key = match.group(1) if match else to_str
         else:
             # Default to grouping by thread if unknown strategy
@@ -9,18 +9,89 @@ and ensure data integrity.
 import os
 import re
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 
 
+class _FilenameTable(dict):
+    """
+    str.translate table for sanitize_filename.
+    
+    Maps word characters, hyphens and periods to themselves and everything
+    else (whitespace included) to an underscore. Entries are filled in on
+    first lookup, so only code points actually seen are stored.
+    """
+    
+    def __missing__(self, codepoint: int) -> int:
+        char = chr(codepoint)
+        if char.isalnum() or char in '_-.':
+            mapped = codepoint
+        else:
+            mapped = ord('_')
+        self[codepoint] = mapped
+        return mapped
+
+
+_FILENAME_TABLE = _FilenameTable()
+# Same mapping as a bytes.translate table for the common ASCII-only case
+_ASCII_FILENAME_TABLE = bytes(
+    _FILENAME_TABLE[c] if c < 128 else ord('_') for c in range(256)
+)
+_UNDERSCORE_RUNS = re.compile(r'_{2,}')
+
+# Device names Windows refuses as file stems
+_WINDOWS_RESERVED = frozenset(
+    {'CON', 'PRN', 'AUX', 'NUL'}
+    | {f'COM{i}' for i in range(1, 10)}
+    | {f'LPT{i}' for i in range(1, 10)}
+)
+_LONGEST_RESERVED = max(map(len, _WINDOWS_RESERVED))
+
+# Control characters (C0 and DEL) are never valid in a label name
+_LABEL_FORBIDDEN = frozenset(map(chr, range(32))) | {'\x7f'}
+
+# Size strings such as "50MB" or "1.5 GB" (matched after upper-casing)
+_SIZE_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*([KMGT]?B?)$')
+_SIZE_MULTIPLIERS = {
+    'B': 1,
+    'KB': 1024,
+    'MB': 1024 ** 2,
+    'GB': 1024 ** 3,
+    'TB': 1024 ** 4,
+}
+
+# RFC 5322 simplified regex
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
 class ValidationError(Exception):
     """Raised when validation fails."""
     pass
 
 
+def _is_within(path: str, base: str) -> bool:
+    """
+    Check whether an absolute, normalized path lies inside base.
+    
+    Args:
+        path: Absolute path to check
+        base: Absolute base directory
+        
+    Returns:
+        bool: True if path is base or a descendant of it
+    """
+    try:
+        return os.path.commonpath([path, base]) == base
+    except ValueError:
+        # Different drives on Windows
+        return False
+
+
 class PathValidator:
     """Validates file paths for security."""
     
+    __slots__ = ()
+    
     @staticmethod
     def validate_output_directory(path: str, base_dir: Optional[str] = None) -> Path:
         """
@@ -41,27 +112,24 @@ class PathValidator:
         if not path:
             raise ValidationError("Output directory cannot be empty")
         
-        # Convert to Path object
-        path_obj = Path(path).expanduser()
+        expanded = os.path.expanduser(path)
         
-        # Check for suspicious patterns
-        if ".." in str(path_obj):
+        # Check for suspicious patterns (before normalization folds them away)
+        if '..' in expanded.replace(os.sep, '/').split('/'):
             raise ValidationError("Path cannot contain '..' (directory traversal)")
         
-        # Make absolute
-        abs_path = path_obj.resolve()
+        # Make absolute, resolving symlinks so they cannot lead outside base_dir
+        abs_path = os.path.realpath(expanded)
         
         # If base_dir specified, ensure path is within it
         if base_dir:
-            base_abs = Path(base_dir).expanduser().resolve()
-            try:
-                abs_path.relative_to(base_abs)
-            except ValueError:
+            base_abs = os.path.realpath(os.path.expanduser(base_dir))
+            if not _is_within(abs_path, base_abs):
                 raise ValidationError(
                     f"Path {path} is outside allowed directory {base_dir}"
                 )
         
-        return abs_path
+        return Path(abs_path)
     
     @staticmethod
     def validate_file_path(path: str, base_dir: str) -> Path:
@@ -81,28 +149,24 @@ class PathValidator:
         if not path:
             raise ValidationError("File path cannot be empty")
         
-        path_obj = Path(path)
-        
         # Check for absolute paths (not allowed)
-        if path_obj.is_absolute():
+        if os.path.isabs(path):
             raise ValidationError("Absolute paths not allowed")
         
         # Check for suspicious patterns
-        if ".." in str(path_obj) or str(path_obj).startswith("/"):
+        if ".." in path or path.startswith("/"):
             raise ValidationError("Invalid path: contains '..' or starts with '/'")
         
-        # Combine with base directory
-        full_path = Path(base_dir) / path_obj
-        abs_path = full_path.resolve()
+        # Combine with base directory, resolving symlinks so a link inside
+        # base_dir cannot redirect writes outside it
+        base_abs = os.path.realpath(base_dir)
+        abs_path = os.path.realpath(os.path.join(base_abs, path))
         
         # Ensure still within base directory
-        base_abs = Path(base_dir).resolve()
-        try:
-            abs_path.relative_to(base_abs)
-        except ValueError:
+        if not _is_within(abs_path, base_abs):
             raise ValidationError(f"Path {path} escapes base directory")
         
-        return abs_path
+        return Path(abs_path)
     
     @staticmethod
     def sanitize_filename(filename: str, max_length: int = 255) -> str:
@@ -119,23 +183,57 @@ class PathValidator:
         if not filename:
             return "unnamed"
         
-        # Remove or replace dangerous characters
-        # Keep alphanumeric, spaces, hyphens, underscores, periods
-        sanitized = re.sub(r'[^\w\s\-\.]', '_', filename)
+        # Runaway inputs (e.g. encoded blobs in subjects): sanitize a bounded
+        # head plus the extension first. Sanitizing never reorders text, so
+        # if that already fills max_length it equals the full result. Only
+        # safe once max_length exceeds every reserved stem; a shorter head
+        # could match a reserved name that the full input does not.
+        limit = 2 * max_length
+        if max_length > _LONGEST_RESERVED and len(filename) > limit:
+            stem, dot, ext = filename.rpartition('.')
+            if not dot:
+                head = filename[:limit]
+            elif ext.isalnum() and len(ext) < max_length // 2:
+                head = f"{stem[:limit]}.{ext}"
+            else:
+                head = None
+            if head is not None:
+                result = PathValidator._sanitize(head, max_length)
+                if len(result) == max_length:
+                    return result
         
-        # Replace multiple spaces/underscores with single
-        sanitized = re.sub(r'[\s_]+', '_', sanitized)
+        return PathValidator._sanitize(filename, max_length)
+    
+    @staticmethod
+    def _sanitize(filename: str, max_length: int) -> str:
+        """
+        Sanitize a non-empty filename in full.
+        
+        Args:
+            filename: Original filename
+            max_length: Maximum filename length
+            
+        Returns:
+            str: Sanitized filename
+        """
+        # Replace dangerous characters and whitespace in one pass
+        # Keep alphanumeric, hyphens, underscores, periods
+        if filename.isascii():
+            sanitized = filename.encode('ascii').translate(
+                _ASCII_FILENAME_TABLE
+            ).decode('ascii')
+        else:
+            sanitized = filename.translate(_FILENAME_TABLE)
+        
+        # Replace multiple underscores with single
+        sanitized = _UNDERSCORE_RUNS.sub('_', sanitized)
         
         # Remove leading/trailing spaces and dots
         sanitized = sanitized.strip('. ')
         
         # Handle reserved names on Windows
-        reserved = {'CON', 'PRN', 'AUX', 'NUL', 'COM1', 'COM2', 'COM3', 'COM4',
-                   'COM5', 'COM6', 'COM7', 'COM8', 'COM9', 'LPT1', 'LPT2',
-                   'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'}
-        
         name_without_ext = sanitized.rsplit('.', 1)[0].upper()
-        if name_without_ext in reserved:
+        if name_without_ext in _WINDOWS_RESERVED:
             sanitized = f"file_{sanitized}"
         
         # Truncate if too long, preserving extension
@@ -153,10 +251,9 @@ class PathValidator:
 class EmailValidator:
     """Validates email addresses."""
     
-    # RFC 5322 simplified regex
-    EMAIL_REGEX = re.compile(
-        r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    )
+    __slots__ = ()
+    
+    EMAIL_REGEX = _EMAIL_RE
     
     @staticmethod
     def validate_email(email: str) -> str:
@@ -177,21 +274,50 @@ class EmailValidator:
         
         email = email.strip()
         
-        if not EmailValidator.EMAIL_REGEX.match(email):
+        # Cheap length guard before running the regex
+        if len(email) > 254:  # RFC 5321
+            raise ValidationError("Email address too long (max 254 characters)")
+        
+        if not _EMAIL_RE.match(email):
             raise ValidationError(
                 f"Invalid email address: {email}. "
                 "Expected format: user@example.com"
             )
         
-        if len(email) > 254:  # RFC 5321
-            raise ValidationError("Email address too long (max 254 characters)")
-        
         return email
+    
+    @staticmethod
+    def validate_emails(emails: Iterable[str]) -> Iterator[str]:
+        """
+        Validate many email addresses lazily.
+        
+        Applies the same checks as validate_email, with the regex lookup
+        hoisted out of the loop.
+        
+        Args:
+            emails: Email addresses to validate
+            
+        Yields:
+            str: Each validated email address, stripped
+            
+        Raises:
+            ValidationError: On the first invalid address
+        """
+        match = _EMAIL_RE.match
+        for email in emails:
+            stripped = email.strip() if email else email
+            if stripped and len(stripped) <= 254 and match(stripped):
+                yield stripped
+            else:
+                # Slow path only to raise the specific error
+                yield EmailValidator.validate_email(email)
 
 
 class GmailValidator:
     """Validates Gmail-specific inputs."""
     
+    __slots__ = ()
+    
     @staticmethod
     def validate_label(label: str) -> str:
         """
@@ -211,8 +337,8 @@ class GmailValidator:
         
         label = label.strip()
         
-        # Gmail labels can contain most characters, but check for suspicious ones
-        if any(c in label for c in ['\0', '\n', '\r']):
+        # Gmail labels can contain most characters, but not control characters
+        if not _LABEL_FORBIDDEN.isdisjoint(label):
             raise ValidationError("Label contains invalid characters")
         
         if len(label) > 225:  # Gmail limit
@@ -241,16 +367,17 @@ class GmailValidator:
         
         query = query.strip()
         
-        # Check for balanced quotes
-        if query.count('"') % 2 != 0:
-            raise ValidationError("Unbalanced quotes in search query")
+        # Cheapest checks first: length, then a single-character scan
+        if len(query) > 10000:  # Reasonable limit
+            raise ValidationError("Query too long (max 10000 characters)")
         
         # Check for null bytes
         if '\0' in query:
             raise ValidationError("Query contains null bytes")
         
-        if len(query) > 10000:  # Reasonable limit
-            raise ValidationError("Query too long (max 10000 characters)")
+        # Check for balanced quotes
+        if query.count('"') & 1:
+            raise ValidationError("Unbalanced quotes in search query")
         
         return query
 
@@ -258,6 +385,8 @@ class GmailValidator:
 class DateValidator:
     """Validates date inputs."""
     
+    __slots__ = ()
+    
     @staticmethod
     def validate_date_range(
         start_date: Optional[str],
@@ -276,12 +405,17 @@ class DateValidator:
         Raises:
             ValidationError: If dates are invalid
         """
+        # Date filters are optional; skip all parsing when neither is set
+        if not start_date and not end_date:
+            return None, None
+        
+        parse = datetime.fromisoformat
         start_dt = None
         end_dt = None
         
         if start_date:
             try:
-                start_dt = datetime.fromisoformat(start_date)
+                start_dt = parse(start_date)
             except ValueError:
                 raise ValidationError(
                     f"Invalid start date: {start_date}. "
@@ -290,7 +424,7 @@ class DateValidator:
         
         if end_date:
             try:
-                end_dt = datetime.fromisoformat(end_date)
+                end_dt = parse(end_date)
             except ValueError:
                 raise ValidationError(
                     f"Invalid end date: {end_date}. "
@@ -307,6 +441,8 @@ class DateValidator:
 class SizeValidator:
     """Validates size limits."""
     
+    __slots__ = ()
+    
     @staticmethod
     def validate_size_limit(size: int, min_size: int = 1024, max_size: int = 1073741824) -> int:
         """
@@ -355,7 +491,7 @@ class SizeValidator:
         size_str = size_str.strip().upper()
         
         # Extract number and unit
-        match = re.match(r'^(\d+(?:\.\d+)?)\s*([KMGT]?B?)$', size_str)
+        match = _SIZE_RE.match(size_str)
         if not match:
             raise ValidationError(
                 f"Invalid size format: {size_str}. "
@@ -366,13 +502,4 @@ class SizeValidator:
         number = float(number)
         
         # Convert to bytes
-        multipliers = {
-            'B': 1,
-            'KB': 1024,
-            'MB': 1024 ** 2,
-            'GB': 1024 ** 3,
-            'TB': 1024 ** 4,
-        }
-        
-        multiplier = multipliers.get(unit, 1)
-        return int(number * multiplier)
+        return int(number * _SIZE_MULTIPLIERS.get(unit, 1))
@@ -46,6 +46,10 @@ setup(
         "dev": [
             "pytest>=7.4.0",
             "pytest-cov>=4.1.0",
+            "pytest-xdist>=3.3.0",
+            "pytest-benchmark>=4.0.0",
+            "pyfakefs>=5.3.0",
+            "hypothesis>=6.82.0",
             "black>=23.7.0",
             "flake8>=6.1.0",
             "isort>=5.12.0",
@@ -1,5 +1,8 @@
 """Pytest configuration and fixtures."""
 
+import os
+import shutil
+
 import pytest
 from unittest.mock import Mock
 
@@ -125,6 +128,49 @@ def temp_output_dir(tmp_path):
     return output_dir
 
 
+@pytest.fixture(scope="session")
+def shared_tmp(tmp_path_factory):
+    """Single temporary root shared by the whole test session."""
+    return tmp_path_factory.mktemp("shared")
+
+
+@pytest.fixture
+def scratch_dir(shared_tmp, request):
+    """Unique per-test subdirectory of the shared temporary root."""
+    directory = shared_tmp / request.node.name
+    directory.mkdir()
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def encryption(tmp_path_factory):
+    """
+    Session-wide TokenEncryption instance.
+
+    The PBKDF2 key is derived once per run. Under pytest-xdist the first
+    worker writes it to the shared base temp directory and the other
+    workers reuse it instead of repeating the derivation.
+    """
+    from gmail_to_notebooklm.encryption import TokenEncryption
+
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    if worker_id == "master":
+        return TokenEncryption()
+
+    key_file = tmp_path_factory.getbasetemp().parent / "fernet.key"
+    if key_file.exists():
+        key = key_file.read_bytes()
+    else:
+        key = TokenEncryption._derive_key()
+        # Write under a worker-specific name, then rename atomically
+        partial = key_file.with_name(f"fernet.key.{worker_id}")
+        partial.write_bytes(key)
+        os.replace(partial, key_file)
+
+    return TokenEncryption(key=key)
+
+
 @pytest.fixture
 def sample_markdown_content():
     """Sample Markdown content for testing."""
@@ -2,9 +2,6 @@
 Tests for audit logging functionality.
 """
 
-import json
-import os
-import tempfile
 from pathlib import Path
 
 import pytest
@@ -18,16 +15,16 @@ from gmail_to_notebooklm.audit import (
 class TestAuditLogger:
     """Test audit logger functionality."""
     
-    def test_audit_logger_initialization(self, tmp_path):
+    def test_audit_logger_initialization(self, scratch_dir):
         """Test audit logger initializes correctly."""
-        log_file = tmp_path / "audit.log"
+        log_file = scratch_dir / "audit.log"
         logger = AuditLogger(str(log_file))
         
         assert logger.log_file == Path(log_file)
     
-    def test_log_export_started(self, tmp_path):
+    def test_log_export_started(self, scratch_dir):
         """Test logging export started event."""
-        log_file = tmp_path / "audit.log"
+        log_file = scratch_dir / "audit.log"
         logger = AuditLogger(str(log_file))
         
         logger.log_export_started(
@@ -36,69 +33,66 @@ class TestAuditLogger:
             query="test query"
         )
         
-        # Read log file
-        with open(log_file) as f:
-            content = f.read()
+        # Read raw bytes; the assertions only need substring checks.
+        # Follow-up: AuditLogger could write encoded JSON lines directly
+        # (os.write(fd, json_bytes + b"\n")) and skip text-mode buffering.
+        content = log_file.read_bytes()
         
         # Check that event was logged
-        assert "export_started" in content
-        assert "test123" in content
+        assert b"export_started" in content
+        assert b"test123" in content
     
-    def test_log_auth_succeeded(self, tmp_path):
+    def test_log_auth_succeeded(self, scratch_dir):
         """Test logging authentication success."""
-        log_file = tmp_path / "audit.log"
+        log_file = scratch_dir / "audit.log"
         logger = AuditLogger(str(log_file))
         
         logger.log_auth_succeeded("user@example.com", scopes=["gmail.readonly"])
         
-        with open(log_file) as f:
-            content = f.read()
+        content = log_file.read_bytes()
         
-        assert "auth_succeeded" in content
-        assert "user@example.com" in content
+        assert b"auth_succeeded" in content
+        assert b"user@example.com" in content
     
-    def test_log_config_loaded(self, tmp_path):
+    def test_log_config_loaded(self, scratch_dir):
         """Test logging configuration load."""
-        log_file = tmp_path / "audit.log"
+        log_file = scratch_dir / "audit.log"
         logger = AuditLogger(str(log_file))
         
         logger.log_config_loaded("config.yaml", validation_status="valid")
         
-        with open(log_file) as f:
-            content = f.read()
+        content = log_file.read_bytes()
         
-        assert "config_loaded" in content
-        assert "config.yaml" in content
+        assert b"config_loaded" in content
+        assert b"config.yaml" in content
     
-    def test_log_config_changed(self, tmp_path):
+    def test_log_config_changed(self, scratch_dir):
         """Test logging configuration change."""
-        log_file = tmp_path / "audit.log"
+        log_file = scratch_dir / "audit.log"
         logger = AuditLogger(str(log_file))
         
         logger.log_config_changed("max_results", old_value="100", new_value="200")
         
-        with open(log_file) as f:
-            content = f.read()
+        content = log_file.read_bytes()
         
-        assert "config_changed" in content
-        assert "max_results" in content
+        assert b"config_changed" in content
+        assert b"max_results" in content
     
-    def test_log_api_error(self, tmp_path):
+    def test_log_api_error(self, scratch_dir):
         """Test logging API error."""
-        log_file = tmp_path / "audit.log"
+        log_file = scratch_dir / "audit.log"
         logger = AuditLogger(str(log_file))
         
         logger.log_api_error("gmail.messages.list", error_code=429, error_message="Rate limit exceeded")
         
-        with open(log_file) as f:
-            content = f.read()
+        content = log_file.read_bytes()
         
-        assert "api_error" in content
-        assert "gmail.messages.list" in content
+        assert b"api_error" in content
+        assert b"gmail.messages.list" in content
     
-    def test_get_audit_logger_singleton(self, tmp_path):
+    def test_get_audit_logger_singleton(self, scratch_dir):
         """Test get_audit_logger returns singleton."""
-        log_file = tmp_path / "audit.log"
+        log_file = scratch_dir / "audit.log"
         
         logger1 = get_audit_logger(str(log_file))
         logger2 = get_audit_logger(str(log_file))
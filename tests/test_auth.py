@@ -6,6 +6,15 @@ from unittest.mock import Mock, patch, mock_open
 from gmail_to_notebooklm.auth import authenticate, revoke_token, AuthenticationError
 
 
+@pytest.fixture
+def auth_patches():
+    """Patch the OAuth flow and pickle module used by the auth module."""
+    with patch("gmail_to_notebooklm.auth.InstalledAppFlow") as mock_flow, patch(
+        "gmail_to_notebooklm.auth.pickle"
+    ) as mock_pickle:
+        yield mock_flow, mock_pickle
+
+
 class TestAuthentication:
     """Tests for OAuth 2.0 authentication."""
 
@@ -19,12 +28,10 @@ class TestAuthentication:
         assert "Credentials file not found" in str(exc_info.value)
         assert "OAUTH_SETUP.md" in str(exc_info.value)
 
-    @patch("gmail_to_notebooklm.auth.InstalledAppFlow")
-    @patch("gmail_to_notebooklm.auth.pickle")
-    def test_authenticate_first_run(
-        self, mock_pickle, mock_flow, tmp_path, mock_credentials
-    ):
+    def test_authenticate_first_run(self, auth_patches, tmp_path, mock_credentials):
         """Test first-time authentication flow."""
+        mock_flow, mock_pickle = auth_patches
+
         # Create fake credentials file
         creds_file = tmp_path / "credentials.json"
         creds_file.write_text('{"installed": {}}')
@@ -0,0 +1,33 @@
+"""Micro-benchmarks for hot paths.
+
+Run with ``make benchmark`` to compare against the last saved run and fail
+when a median regresses by more than 10%.
+"""
+
+import pytest
+
+from gmail_to_notebooklm.rate_limiter import RateLimiter
+from gmail_to_notebooklm.validation import PathValidator
+
+pytest.importorskip("pytest_benchmark")
+
+LONG_TITLE = "long title " * 40
+
+
+@pytest.mark.benchmark(group="rate_limiter")
+def test_bench_calculate_backoff(benchmark):
+    """Benchmark backoff calculation deep into the retry schedule."""
+    limiter = RateLimiter()
+
+    result = benchmark(limiter.calculate_backoff, 20, jitter=False)
+
+    assert result == limiter.max_backoff
+
+
+@pytest.mark.benchmark(group="validation")
+def test_bench_sanitize_filename(benchmark):
+    """Benchmark uncached filename sanitization of a long subject line."""
+    result = benchmark(PathValidator.sanitize_filename, LONG_TITLE)
+
+    assert len(result) <= 255
+    assert " " not in result
@@ -37,39 +37,22 @@ def test_config_get_all():
     assert "verbose" in all_config
 
 
-def test_config_validation_output_dir():
-    """Test validation of output_dir field."""
+@pytest.mark.parametrize(
+    "field,value,match",
+    [
+        ("output_dir", 123, "output_dir must be a string"),
+        ("max_results", -5, "max_results must be a positive integer"),
+        ("verbose", "yes", "verbose must be a boolean"),
+        ("date_format", "INVALID", "date_format must be one of"),
+    ],
+    ids=["output_dir", "max_results", "boolean_fields", "date_format"],
+)
+def test_config_validation(field, value, match):
+    """Test validation rejects an invalid value for each field."""
     config = Config()
-    config.config_data["output_dir"] = 123  # Invalid type
+    config.config_data[field] = value
 
-    with pytest.raises(ConfigError, match="output_dir must be a string"):
-        config.validate()
-
-
-def test_config_validation_max_results():
-    """Test validation of max_results field."""
-    config = Config()
-    config.config_data["max_results"] = -5  # Invalid value
-
-    with pytest.raises(ConfigError, match="max_results must be a positive integer"):
-        config.validate()
-
-
-def test_config_validation_boolean_fields():
-    """Test validation of boolean fields."""
-    config = Config()
-    config.config_data["verbose"] = "yes"  # Invalid type
-
-    with pytest.raises(ConfigError, match="verbose must be a boolean"):
-        config.validate()
-
-
-def test_config_validation_date_format():
-    """Test validation of date_format field."""
-    config = Config()
-    config.config_data["date_format"] = "INVALID"
-
-    with pytest.raises(ConfigError, match="date_format must be one of"):
+    with pytest.raises(ConfigError, match=match):
         config.validate()
 
 
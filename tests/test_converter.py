@@ -85,6 +85,7 @@ class TestMarkdownConverter:
         converted = converter.convert_emails_batch(emails)
 
         assert len(converted) == 2
-        assert all(isinstance(c[0], str) for c in converted)  # email_id
-        assert all(isinstance(c[1], str) for c in converted)  # markdown
-        assert all("---" in c[1] for c in converted)
+        email_ids, markdowns = zip(*converted)
+        assert set(map(type, email_ids)) == {str}
+        assert set(map(type, markdowns)) == {str}
+        assert sum("---" in m for m in markdowns) == len(converted)
@@ -1,11 +1,20 @@
 """Tests for token encryption module."""
 
+import os
+import sys
+
 import pytest
 from pathlib import Path
 import pickle
 
+from cryptography.fernet import Fernet
+
 from gmail_to_notebooklm.encryption import TokenEncryption, get_encryption
 
+# Constant sample payloads, built once at import time
+_PICKLED_SAMPLE = pickle.dumps({"token": "value"})
+_BINARY_SAMPLE = bytes(range(256))
+
 
 class TestTokenEncryption:
     """Test token encryption functionality."""
@@ -16,9 +25,8 @@ class TestTokenEncryption:
         assert encryption is not None
         assert encryption._fernet is not None
     
-    def test_encrypt_decrypt_roundtrip(self):
+    def test_encrypt_decrypt_roundtrip(self, encryption):
         """Test encryption and decryption round-trip."""
-        encryption = TokenEncryption()
         original_data = b"test token data"
         
         # Encrypt
@@ -30,9 +38,8 @@ class TestTokenEncryption:
         decrypted = encryption.decrypt(encrypted)
         assert decrypted == original_data
     
-    def test_encrypt_decrypt_with_unicode(self):
+    def test_encrypt_decrypt_with_unicode(self, encryption):
         """Test encryption with unicode characters."""
-        encryption = TokenEncryption()
         original_data = "Hello 世界 🌍".encode('utf-8')
         
         encrypted = encryption.encrypt(original_data)
@@ -41,17 +48,15 @@ class TestTokenEncryption:
         assert decrypted == original_data
         assert decrypted.decode('utf-8') == "Hello 世界 🌍"
     
-    def test_decrypt_invalid_data(self):
+    def test_decrypt_invalid_data(self, encryption):
         """Test decryption with invalid data."""
-        encryption = TokenEncryption()
         invalid_data = b"not encrypted data"
         
         result = encryption.decrypt(invalid_data)
         assert result is None
     
-    def test_decrypt_corrupted_data(self):
+    def test_decrypt_corrupted_data(self, encryption):
         """Test decryption with corrupted encrypted data."""
-        encryption = TokenEncryption()
         original_data = b"test data"
         
         encrypted = encryption.encrypt(original_data)
@@ -61,10 +66,8 @@ class TestTokenEncryption:
         result = encryption.decrypt(corrupted)
         assert result is None
     
-    def test_is_encrypted_detection(self):
+    def test_is_encrypted_detection(self, encryption):
         """Test encrypted data detection."""
-        encryption = TokenEncryption()
-        
         # Test with encrypted data
         encrypted = encryption.encrypt(b"test")
         assert TokenEncryption.is_encrypted(encrypted) is True
@@ -74,8 +77,7 @@ class TestTokenEncryption:
         assert TokenEncryption.is_encrypted(unencrypted) is False
         
         # Test with pickle data (common for tokens)
-        pickled = pickle.dumps({"token": "value"})
-        assert TokenEncryption.is_encrypted(pickled) is False
+        assert TokenEncryption.is_encrypted(_PICKLED_SAMPLE) is False
     
     def test_is_encrypted_with_short_data(self):
         """Test encrypted detection with short data."""
@@ -83,12 +85,10 @@ class TestTokenEncryption:
         assert TokenEncryption.is_encrypted(b"x") is False
         assert TokenEncryption.is_encrypted(b"") is False
     
-    def test_encrypt_file(self, tmp_path):
+    def test_encrypt_file(self, encryption, scratch_dir):
         """Test file encryption."""
-        encryption = TokenEncryption()
-        
         # Create test file
-        test_file = tmp_path / "test.txt"
+        test_file = scratch_dir / "test.txt"
         test_data = b"test file content"
         test_file.write_bytes(test_data)
         
@@ -106,11 +106,9 @@ class TestTokenEncryption:
         assert encrypted_data != test_data
         assert TokenEncryption.is_encrypted(encrypted_data)
     
-    def test_encrypt_file_without_backup(self, tmp_path):
+    def test_encrypt_file_without_backup(self, encryption, scratch_dir):
         """Test file encryption without backup."""
-        encryption = TokenEncryption()
-        
-        test_file = tmp_path / "test.txt"
+        test_file = scratch_dir / "test.txt"
         test_data = b"test content"
         test_file.write_bytes(test_data)
         
@@ -121,12 +119,10 @@ class TestTokenEncryption:
         backup_file = test_file.with_suffix(test_file.suffix + '.backup')
         assert not backup_file.exists()
     
-    def test_decrypt_file(self, tmp_path):
+    def test_decrypt_file(self, encryption, scratch_dir):
         """Test file decryption."""
-        encryption = TokenEncryption()
-        
         # Create and encrypt file
-        test_file = tmp_path / "test.txt"
+        test_file = scratch_dir / "test.txt"
         test_data = b"test file content"
         test_file.write_bytes(test_data)
         
@@ -136,18 +132,16 @@ class TestTokenEncryption:
         decrypted = encryption.decrypt_file(test_file)
         assert decrypted == test_data
     
-    def test_decrypt_nonexistent_file(self, tmp_path):
+    def test_decrypt_nonexistent_file(self, encryption, scratch_dir):
         """Test decrypting non-existent file."""
-        encryption = TokenEncryption()
-        
-        nonexistent = tmp_path / "nonexistent.txt"
+        nonexistent = scratch_dir / "nonexistent.txt"
         result = encryption.decrypt_file(nonexistent)
         assert result is None
     
-    def test_key_derivation_consistency(self):
+    def test_key_derivation_consistency(self, encryption):
         """Test that key derivation is consistent."""
         encryption1 = TokenEncryption()
-        encryption2 = TokenEncryption()
+        encryption2 = encryption
         
         # Same system should derive same key
         test_data = b"test data"
@@ -157,10 +151,16 @@ class TestTokenEncryption:
         decrypted = encryption2.decrypt(encrypted1)
         assert decrypted == test_data
     
-    def test_large_data_encryption(self):
-        """Test encryption of large data."""
-        encryption = TokenEncryption()
+    def test_explicit_key(self, encryption):
+        """Test that an explicit key replaces the derived one."""
+        custom = TokenEncryption(key=Fernet.generate_key())
         
+        encrypted = custom.encrypt(b"test data")
+        assert custom.decrypt(encrypted) == b"test data"
+        assert encryption.decrypt(encrypted) is None
+    
+    def test_large_data_encryption(self, encryption):
+        """Test encryption of large data."""
         # Create 1MB of data
         large_data = b"x" * (1024 * 1024)
         
@@ -187,49 +187,42 @@ class TestTokenEncryption:
 class TestEncryptionEdgeCases:
     """Test edge cases and error conditions."""
     
-    def test_empty_data_encryption(self):
+    def test_empty_data_encryption(self, encryption):
         """Test encrypting empty data."""
-        encryption = TokenEncryption()
-        
         empty_data = b""
         encrypted = encryption.encrypt(empty_data)
         decrypted = encryption.decrypt(encrypted)
         
         assert decrypted == empty_data
     
-    def test_binary_data_encryption(self):
+    def test_binary_data_encryption(self, encryption):
         """Test encrypting binary data."""
-        encryption = TokenEncryption()
-        
         # Test with various binary patterns
-        binary_data = bytes(range(256))
-        encrypted = encryption.encrypt(binary_data)
+        encrypted = encryption.encrypt(_BINARY_SAMPLE)
         decrypted = encryption.decrypt(encrypted)
         
-        assert decrypted == binary_data
+        assert decrypted == _BINARY_SAMPLE
     
-    def test_encrypt_file_permission_error(self, tmp_path):
+    @pytest.mark.skipif(
+        sys.platform == "win32" or os.geteuid() == 0,
+        reason="chmod semantics vary",
+    )
+    def test_encrypt_file_permission_error(self, encryption, scratch_dir):
         """Test file encryption with permission error."""
-        encryption = TokenEncryption()
-        
         # Create read-only file
-        test_file = tmp_path / "readonly.txt"
+        test_file = scratch_dir / "readonly.txt"
         test_file.write_bytes(b"test")
         test_file.chmod(0o444)
         
         try:
             result = encryption.encrypt_file(test_file)
-            # On some systems this might succeed, on others it fails
-            # Just ensure it doesn't crash
-            assert result in [True, False]
+            assert result is False
         finally:
             # Restore permissions for cleanup
             test_file.chmod(0o644)
     
-    def test_multiple_encryption_rounds(self):
+    def test_multiple_encryption_rounds(self, encryption):
         """Test encrypting already encrypted data."""
-        encryption = TokenEncryption()
-        
         original = b"test data"
         encrypted1 = encryption.encrypt(original)
         encrypted2 = encryption.encrypt(encrypted1)
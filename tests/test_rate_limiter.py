@@ -2,7 +2,6 @@
 
 import pytest
 import time
-from datetime import datetime, timedelta
 
 from gmail_to_notebooklm.rate_limiter import (
     RateLimiter,
@@ -11,15 +10,79 @@ from gmail_to_notebooklm.rate_limiter import (
     LabelCache,
     get_rate_limiter,
     get_label_cache,
+    with_retry,
 )
 
+# Shared by reference; tuples where mutation isn't under test.
+_COMPLEX = {
+    "list": (1, 2, 3),
+    "dict": {"key": "value"},
+    "nested": {"a": {"b": {"c": "deep"}}},
+}
+
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic and time.sleep."""
+    
+    def __init__(self, start: float = 1000.0):
+        self._now = start
+        self.sleeps = []
+    
+    def now(self) -> float:
+        return self._now
+    
+    def tick(self, seconds: float):
+        self._now += seconds
+    
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.tick(seconds)
+
+
+@pytest.fixture
+def clock():
+    """Fake clock; pass clock.sleep as sleep_func to record waits instead of blocking."""
+    return FakeClock()
+
+
+@pytest.fixture(scope="module")
+def limiter():
+    """Rate limiter with default settings shared by the whole module."""
+    return RateLimiter(requests_per_second=10.0)
+
+
+@pytest.fixture(autouse=True)
+def _reset_limiter(limiter):
+    """Clear the shared limiter's state after every test."""
+    yield
+    limiter.reset()
+
+
+@pytest.fixture(
+    params=[(0, 1.0), (1, 2.0), (2, 4.0), (3, 8.0)],
+    ids=lambda case: f"attempt{case[0]}",
+)
+def backoff_case(request):
+    """(retry_count, expected backoff) pairs for the default 1s x2 schedule."""
+    return request.param
+
+
+@pytest.fixture(
+    params=[(CachedValue, "set", "get"), (LabelCache, "set_labels", "get_labels")],
+    ids=lambda case: case[0].__name__,
+)
+def cache(request, clock):
+    """(cache, setter, getter) for each cache type, with a 60s TTL on the fake clock."""
+    cls, set_name, get_name = request.param
+    store = cls(ttl_seconds=60, time_func=clock.now)
+    return store, getattr(store, set_name), getattr(store, get_name)
+
 
 class TestRateLimiter:
     """Test rate limiter functionality."""
     
-    def test_rate_limiter_initialization(self):
+    def test_rate_limiter_initialization(self, limiter):
         """Test rate limiter initialization."""
-        limiter = RateLimiter(requests_per_second=10.0)
         assert limiter.requests_per_second == 10.0
         assert limiter.min_interval == 0.1
     
@@ -34,31 +97,37 @@ class TestRateLimiter:
         elapsed = time.time() - start
         assert elapsed < 0.01  # Should be instant
     
-    def test_wait_if_needed_throttles(self):
+    def test_wait_if_needed_throttles(self, clock):
         """Test that wait_if_needed throttles requests."""
-        limiter = RateLimiter(requests_per_second=10.0)  # 0.1s between requests
+        # 0.1s between requests
+        limiter = RateLimiter(
+            requests_per_second=10.0, time_func=clock.now, sleep_func=clock.sleep
+        )
         
         # First request should be instant
-        start = time.time()
-        limiter.wait_if_needed()
-        elapsed1 = time.time() - start
-        assert elapsed1 < 0.01
+        assert limiter.wait_if_needed() == 0.0
         
-        # Second request should wait
-        start = time.time()
-        limiter.wait_if_needed()
-        elapsed2 = time.time() - start
-        assert elapsed2 >= 0.09  # Should wait ~0.1s
+        # Request 50ms later should wait out the rest of the interval
+        clock.tick(0.05)
+        assert limiter.wait_if_needed() == pytest.approx(0.05)
+        
+        # Request a full interval later should not wait
+        clock.tick(0.1)
+        assert limiter.wait_if_needed() == 0.0
     
-    def test_calculate_backoff_exponential(self):
+    def test_calculate_backoff_exponential(self, limiter, backoff_case):
         """Test exponential backoff calculation."""
-        limiter = RateLimiter(initial_backoff=1.0, backoff_multiplier=2.0)
+        retry_count, expected = backoff_case
+        
+        # Shared limiter uses initial_backoff=1.0 and backoff_multiplier=2.0
+        assert limiter.calculate_backoff(retry_count, jitter=False) == expected
+    
+    def test_calculate_backoff_non_doubling_multiplier(self):
+        """Test backoff with a multiplier other than the default 2.0."""
+        limiter = RateLimiter(initial_backoff=0.5, backoff_multiplier=3.0)
         
-        # Test exponential growth
-        assert limiter.calculate_backoff(0, jitter=False) == 1.0
-        assert limiter.calculate_backoff(1, jitter=False) == 2.0
-        assert limiter.calculate_backoff(2, jitter=False) == 4.0
-        assert limiter.calculate_backoff(3, jitter=False) == 8.0
+        assert limiter.calculate_backoff(0, jitter=False) == 0.5
+        assert limiter.calculate_backoff(2, jitter=False) == 4.5
     
     def test_calculate_backoff_max_limit(self):
         """Test backoff respects max limit."""
@@ -73,16 +142,19 @@ class TestRateLimiter:
         limiter = RateLimiter(initial_backoff=10.0)
         
         # With jitter, should vary slightly
-        backoffs = [limiter.calculate_backoff(0, jitter=True) for _ in range(10)]
+        backoffs = limiter.calculate_backoff_batch(0, 10, jitter=True)
         
         # Should all be close to 10.0 but not identical
-        assert all(9.0 <= b <= 11.0 for b in backoffs)
+        assert 9.0 <= min(backoffs) and max(backoffs) <= 11.0
         assert len(set(backoffs)) > 1  # Should have variation
     
-    def test_handle_rate_limit_error(self):
+    def test_calculate_backoff_batch_without_jitter(self, limiter):
+        """Test batch backoff without jitter repeats the base value."""
+        assert limiter.calculate_backoff_batch(2, 3, jitter=False) == [4.0, 4.0, 4.0]
+    
+    def test_handle_rate_limit_error(self, clock):
         """Test handling rate limit error."""
-        limiter = RateLimiter()
-        
+        limiter = RateLimiter(time_func=clock.now)
         limiter.handle_rate_limit_error("test_endpoint", retry_after=30)
         
         assert limiter.is_rate_limited("test_endpoint")
@@ -90,27 +162,36 @@ class TestRateLimiter:
         # Check wait time is set correctly
         status = limiter.get_rate_limit_status("test_endpoint")
         assert status['rate_limited'] is True
-        assert status['seconds_remaining'] > 0
+        assert status['seconds_remaining'] == pytest.approx(30)
+        
+        clock.tick(10)
+        status = limiter.get_rate_limit_status("test_endpoint")
+        assert status['seconds_remaining'] == pytest.approx(20)
     
-    def test_handle_rate_limit_error_no_retry_after(self):
+    def test_handle_rate_limit_error_no_retry_after(self, clock):
         """Test handling rate limit without retry_after."""
-        limiter = RateLimiter()
-        
+        limiter = RateLimiter(time_func=clock.now)
         limiter.handle_rate_limit_error("test_endpoint")
         
         assert limiter.is_rate_limited("test_endpoint")
+        
+        # Defaults to a 60 second wait
+        clock.tick(59.9)
+        assert limiter.is_rate_limited("test_endpoint")
+        clock.tick(0.2)
+        assert not limiter.is_rate_limited("test_endpoint")
     
-    def test_is_rate_limited_expires(self):
+    def test_is_rate_limited_expires(self, clock):
         """Test that rate limit expires."""
-        limiter = RateLimiter()
+        limiter = RateLimiter(time_func=clock.now)
         
         # Set rate limit with very short duration
-        limiter._rate_limited_until["test"] = datetime.now() + timedelta(milliseconds=100)
+        limiter._rate_limited_until["test"] = clock.now() + 0.1
         
         assert limiter.is_rate_limited("test")
         
-        # Wait for expiration
-        time.sleep(0.15)
+        # Advance past expiration
+        clock.tick(0.15)
         
         assert not limiter.is_rate_limited("test")
     
@@ -123,9 +204,8 @@ class TestRateLimiter:
         assert status['rate_limited'] is False
         assert status['requests_per_second'] == 5.0
     
-    def test_get_rate_limit_status_when_limited(self):
+    def test_get_rate_limit_status_when_limited(self, limiter):
         """Test getting status when rate limited."""
-        limiter = RateLimiter()
         limiter.handle_rate_limit_error("test", retry_after=10)
         
         status = limiter.get_rate_limit_status("test")
@@ -133,10 +213,18 @@ class TestRateLimiter:
         assert 'rate_limited_until' in status
         assert 'seconds_remaining' in status
     
-    def test_multiple_endpoints(self):
-        """Test rate limiting multiple endpoints independently."""
-        limiter = RateLimiter()
+    def test_reset(self, limiter):
+        """Test that reset clears throttling and rate limit state."""
+        limiter.wait_if_needed("test")
+        limiter.handle_rate_limit_error("test", retry_after=10)
+        
+        limiter.reset()
         
+        assert not limiter.is_rate_limited("test")
+        assert limiter._last_request_times == {}
+    
+    def test_multiple_endpoints(self, limiter):
+        """Test rate limiting multiple endpoints independently."""
         limiter.handle_rate_limit_error("endpoint1", retry_after=10)
         
         assert limiter.is_rate_limited("endpoint1")
@@ -144,7 +232,7 @@ class TestRateLimiter:
 
 
 class TestCachedValue:
-    """Test cached value functionality."""
+    """Test the cache contract shared by CachedValue and LabelCache."""
     
     def test_cached_value_initialization(self):
         """Test cached value initialization."""
@@ -152,116 +240,57 @@ class TestCachedValue:
         assert cache.ttl_seconds == 60
         assert cache.get() is None
     
-    def test_cached_value_set_get(self):
+    def test_cached_value_set_get(self, cache):
         """Test setting and getting cached value."""
-        cache = CachedValue(ttl_seconds=60)
+        _, set_, get = cache
+        labels = [{"id": "1", "name": "Inbox"}, {"id": "2", "name": "Sent"}]
+        assert get() is None
         
-        cache.set("test value")
-        assert cache.get() == "test value"
+        set_(labels)
+        assert get() == labels
     
-    def test_cached_value_expiration(self):
+    def test_cached_value_expiration(self, cache, clock):
         """Test cached value expiration."""
-        cache = CachedValue(ttl_seconds=0.1)  # 100ms TTL
+        _, set_, get = cache
         
-        cache.set("test value")
-        assert cache.get() == "test value"
+        set_("test value")
+        assert get() == "test value"
         
-        # Wait for expiration
-        time.sleep(0.15)
-        assert cache.get() is None
+        # Advance past expiration
+        clock.tick(61)
+        assert get() is None
     
-    def test_cached_value_clear(self):
+    def test_cached_value_clear(self, cache):
         """Test clearing cached value."""
-        cache = CachedValue(ttl_seconds=60)
+        store, set_, get = cache
         
-        cache.set("test value")
-        assert cache.get() == "test value"
+        set_("test value")
+        assert get() == "test value"
         
-        cache.clear()
-        assert cache.get() is None
+        store.clear()
+        assert get() is None
     
-    def test_cached_value_is_valid(self):
+    def test_cached_value_is_valid(self, cache):
         """Test checking if cache is valid."""
-        cache = CachedValue(ttl_seconds=60)
+        store, set_, _ = cache
         
-        assert not cache.is_valid()
+        assert not store.is_valid()
         
-        cache.set("test value")
-        assert cache.is_valid()
+        set_("test value")
+        assert store.is_valid()
         
-        cache.clear()
-        assert not cache.is_valid()
+        store.clear()
+        assert not store.is_valid()
     
     def test_cached_value_complex_data(self):
         """Test caching complex data structures."""
         cache = CachedValue(ttl_seconds=60)
         
-        complex_data = {
-            "list": [1, 2, 3],
-            "dict": {"key": "value"},
-            "nested": {"a": {"b": {"c": "deep"}}},
-        }
-        
-        cache.set(complex_data)
+        cache.set(_COMPLEX)
         retrieved = cache.get()
         
-        assert retrieved == complex_data
-        assert retrieved is complex_data  # Should be same object
-
-
-class TestLabelCache:
-    """Test label cache functionality."""
-    
-    def test_label_cache_initialization(self):
-        """Test label cache initialization."""
-        cache = LabelCache(ttl_seconds=3600)
-        assert cache.get_labels() is None
-    
-    def test_label_cache_set_get(self):
-        """Test setting and getting labels."""
-        cache = LabelCache(ttl_seconds=3600)
-        
-        labels = [
-            {"id": "1", "name": "Inbox"},
-            {"id": "2", "name": "Sent"},
-        ]
-        
-        cache.set_labels(labels)
-        retrieved = cache.get_labels()
-        
-        assert retrieved == labels
-    
-    def test_label_cache_expiration(self):
-        """Test label cache expiration."""
-        cache = LabelCache(ttl_seconds=0.1)
-        
-        labels = [{"id": "1", "name": "Test"}]
-        cache.set_labels(labels)
-        
-        assert cache.get_labels() == labels
-        
-        # Wait for expiration
-        time.sleep(0.15)
-        assert cache.get_labels() is None
-    
-    def test_label_cache_clear(self):
-        """Test clearing label cache."""
-        cache = LabelCache(ttl_seconds=3600)
-        
-        labels = [{"id": "1", "name": "Test"}]
-        cache.set_labels(labels)
-        
-        cache.clear()
-        assert cache.get_labels() is None
-    
-    def test_label_cache_is_valid(self):
-        """Test checking if label cache is valid."""
-        cache = LabelCache(ttl_seconds=3600)
-        
-        assert not cache.is_valid()
-        
-        cache.set_labels([{"id": "1", "name": "Test"}])
-        assert cache.is_valid()
+        assert retrieved == _COMPLEX
+        assert retrieved is _COMPLEX  # Should be same object
 
 
 class TestGlobalInstances:
@@ -304,33 +333,54 @@ class TestGlobalInstances:
 class TestRateLimiterIntegration:
     """Test rate limiter integration scenarios."""
     
-    def test_rate_limiter_realistic_scenario(self):
+    def test_rate_limiter_realistic_scenario(self, clock):
         """Test rate limiter in realistic scenario."""
-        limiter = RateLimiter(requests_per_second=5.0)  # 5 requests per second
+        # 5 requests per second
+        limiter = RateLimiter(
+            requests_per_second=5.0, time_func=clock.now, sleep_func=clock.sleep
+        )
         
-        start = time.time()
+        start = clock.now()
         
         # Make 10 requests
         for i in range(10):
             limiter.wait_if_needed(f"endpoint_{i % 2}")  # Alternate between 2 endpoints
         
-        elapsed = time.time() - start
+        elapsed = clock.now() - start
         
-        # Should take at least 0.8 seconds (10 requests / 5 per second with some tolerance)
-        # The rate limiter uses per-endpoint tracking, so alternating endpoints
-        # allows more parallelism
-        assert elapsed >= 0.5  # More lenient timing check
+        # The rate limiter uses per-endpoint tracking, so each endpoint makes
+        # 5 requests 0.2s apart and the two schedules overlap
+        assert elapsed == pytest.approx(0.8)
+        assert sum(clock.sleeps) == pytest.approx(0.8)
     
-    def test_rate_limiter_with_errors(self):
+    def test_rate_limiter_with_errors(self, clock):
         """Test rate limiter handling errors."""
-        limiter = RateLimiter(requests_per_second=10.0)
+        limiter = RateLimiter(
+            requests_per_second=10.0, time_func=clock.now, sleep_func=clock.sleep
+        )
         
         # Simulate rate limit error
         limiter.handle_rate_limit_error("test", retry_after=1)
         
         # Should wait when rate limited
-        start = time.time()
-        limiter.wait_if_needed("test")
-        elapsed = time.time() - start
+        waited = limiter.wait_if_needed("test")
         
-        assert elapsed >= 0.9  # Should wait ~1 second
+        assert waited == pytest.approx(1.0)
+        assert clock.sleeps == [pytest.approx(1.0)]
+    
+    def test_with_retry_backs_off_with_sleep_func(self):
+        """Test retry backoff goes through the limiter's sleep_func."""
+        recorded = []
+        limiter = RateLimiter(requests_per_second=0, sleep_func=recorded.append)
+        calls = []
+        
+        @with_retry(rate_limiter=limiter, max_retries=2)
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ValueError("transient")
+            return "ok"
+        
+        assert flaky() == "ok"
+        assert len(recorded) == 2
+        assert recorded[1] > recorded[0]
@@ -1,8 +1,11 @@
 """Tests for input validation module."""
 
+import os
+
 import pytest
 from pathlib import Path
 from datetime import datetime
+from hypothesis import given, settings, strategies as st
 
 from gmail_to_notebooklm.validation import (
     ValidationError,
@@ -13,6 +16,13 @@ from gmail_to_notebooklm.validation import (
     SizeValidator,
 )
 
+# Small example budget; these run on every test invocation
+_PROPERTY_SETTINGS = settings(max_examples=25, deadline=None)
+_PATH_TEXT = st.text(alphabet="abc/.~", max_size=20)
+_COMPONENT = st.text(alphabet="abc.~", min_size=1, max_size=5).filter(
+    lambda part: part != ".."
+)
+
 
 class TestPathValidator:
     """Test path validation functionality."""
@@ -53,6 +63,33 @@ class TestPathValidator:
         with pytest.raises(ValidationError, match="outside allowed directory"):
             PathValidator.validate_output_directory(str(outside_dir), str(base_dir))
     
+    def test_validate_output_directory_sibling_prefix(self, tmp_path):
+        """Test rejecting a sibling directory that shares the base's prefix."""
+        base_dir = tmp_path / "base"
+        sibling = tmp_path / "base2"
+        
+        with pytest.raises(ValidationError, match="outside allowed directory"):
+            PathValidator.validate_output_directory(str(sibling), str(base_dir))
+    
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks unsupported")
+    def test_validate_output_directory_symlink_escape(self, tmp_path):
+        """Test rejecting a directory reached through a symlink out of base."""
+        base_dir = tmp_path / "base"
+        outside = tmp_path / "outside"
+        base_dir.mkdir()
+        outside.mkdir()
+        (base_dir / "link").symlink_to(outside, target_is_directory=True)
+        
+        with pytest.raises(ValidationError, match="outside allowed directory"):
+            PathValidator.validate_output_directory(
+                str(base_dir / "link" / "sub"), str(base_dir)
+            )
+    
+    def test_validate_output_directory_root_base(self, tmp_path):
+        """Test any absolute directory is within the filesystem root."""
+        result = PathValidator.validate_output_directory(str(tmp_path), "/")
+        assert result == tmp_path
+    
     def test_validate_file_path_valid(self, tmp_path):
         """Test validating valid file path."""
         result = PathValidator.validate_file_path("test.txt", str(tmp_path))
@@ -63,16 +100,24 @@ class TestPathValidator:
         result = PathValidator.validate_file_path("sub/dir/test.txt", str(tmp_path))
         assert result == (tmp_path / "sub" / "dir" / "test.txt").resolve()
     
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks unsupported")
+    def test_validate_file_path_symlink_escape(self, tmp_path):
+        """Test rejecting a file path that is a symlink out of the base."""
+        base_dir = tmp_path / "out"
+        target = tmp_path / "outside" / "target"
+        base_dir.mkdir()
+        target.parent.mkdir()
+        target.write_text("")
+        (base_dir / "evil.md").symlink_to(target)
+        
+        with pytest.raises(ValidationError, match="escapes base directory"):
+            PathValidator.validate_file_path("evil.md", str(base_dir))
+    
     def test_validate_file_path_absolute(self, tmp_path):
         """Test rejecting absolute file path."""
         with pytest.raises(ValidationError, match="escapes base directory"):
             PathValidator.validate_file_path("/etc/passwd", str(tmp_path))
     
-    def test_validate_file_path_traversal(self, tmp_path):
-        """Test rejecting file path with traversal."""
-        with pytest.raises(ValidationError, match="Invalid path"):
-            PathValidator.validate_file_path("../../../etc/passwd", str(tmp_path))
-    
     def test_validate_file_path_starts_with_slash(self, tmp_path):
         """Test rejecting path starting with slash."""
         with pytest.raises(ValidationError, match="escapes base directory"):
@@ -97,12 +142,30 @@ class TestPathValidator:
         assert "<" not in result
         assert ">" not in result
     
+    def test_sanitize_filename_unicode_and_whitespace(self):
+        """Test non-ASCII letters are kept and whitespace runs collapse."""
+        result = PathValidator.sanitize_filename("Réunion\t \u00a0été – 2024.md")
+        assert result == "Réunion_été_2024.md"
+    
     def test_sanitize_filename_long(self):
         """Test truncating long filename."""
         long_name = "a" * 300
         result = PathValidator.sanitize_filename(long_name, max_length=255)
         assert len(result) <= 255
     
+    def test_sanitize_filename_runaway_input(self):
+        """Test very long input keeps its extension and matches full sanitization."""
+        runaway = "Re: " + "QUJD" * 5000 + " report.pdf"
+        result = PathValidator.sanitize_filename(runaway, max_length=100)
+        assert len(result) == 100
+        assert result == PathValidator._sanitize(runaway, 100)
+        assert result.startswith("Re_QUJD")
+        assert result.endswith(".pdf")
+    
+    def test_sanitize_filename_tiny_max_length(self):
+        """Test a head cut to a reserved stem does not change the result."""
+        assert PathValidator.sanitize_filename("LPT1U", 2) == "LP"
+    
     def test_sanitize_filename_reserved_windows(self):
         """Test handling Windows reserved names."""
         reserved_names = ["CON", "PRN", "AUX", "NUL", "COM1", "LPT1"]
@@ -128,33 +191,82 @@ class TestPathValidator:
         assert len(result) <= 10
 
 
+@pytest.fixture(scope="module")
+def props_base(tmp_path_factory):
+    """Real base directory for property tests, with symlinks resolved."""
+    return os.path.realpath(tmp_path_factory.mktemp("props"))
+
+
+class TestPathValidatorProperties:
+    """Property-based checks for path validation."""
+    
+    @_PROPERTY_SETTINGS
+    @given(path=_PATH_TEXT)
+    def test_file_path_never_escapes_base(self, props_base, path):
+        """Any accepted file path resolves inside the base directory."""
+        try:
+            result = PathValidator.validate_file_path(path, props_base)
+        except ValidationError:
+            return
+        assert os.path.commonpath([str(result), props_base]) == props_base
+    
+    @_PROPERTY_SETTINGS
+    @given(before=_PATH_TEXT, after=_PATH_TEXT)
+    def test_file_path_rejects_traversal(self, props_base, before, after):
+        """Any file path containing '..' is rejected."""
+        with pytest.raises(ValidationError, match="Invalid path|Absolute paths"):
+            PathValidator.validate_file_path(f"{before}..{after}", props_base)
+    
+    @_PROPERTY_SETTINGS
+    @given(parts=st.lists(_COMPONENT, max_size=4))
+    def test_output_directory_accepts_descendants(self, props_base, parts):
+        """Directories below the base are accepted and resolved."""
+        path = os.path.join(props_base, *parts)
+        result = PathValidator.validate_output_directory(path, props_base)
+        assert str(result) == os.path.realpath(path)
+    
+    @_PROPERTY_SETTINGS
+    @given(
+        before=st.lists(_COMPONENT, max_size=3),
+        after=st.lists(_COMPONENT, max_size=3),
+    )
+    def test_output_directory_rejects_traversal(self, props_base, before, after):
+        """A '..' component is rejected wherever it appears."""
+        path = os.path.join(props_base, *before, "..", *after)
+        with pytest.raises(ValidationError, match="directory traversal"):
+            PathValidator.validate_output_directory(path, props_base)
+
+
 class TestEmailValidator:
     """Test email validation functionality."""
     
-    def test_validate_email_valid(self):
-        """Test validating valid email addresses."""
-        valid_emails = [
+    @pytest.mark.parametrize(
+        "email",
+        [
             "user@example.com",
             "test.user@example.com",
             "user+tag@example.co.uk",
             "user_name@example-domain.com",
-        ]
-        for email in valid_emails:
-            result = EmailValidator.validate_email(email)
-            assert result == email
+        ],
+    )
+    def test_validate_email_valid(self, email):
+        """Test validating valid email addresses."""
+        assert EmailValidator.validate_email(email) == email
     
-    def test_validate_email_invalid(self):
-        """Test rejecting invalid email addresses."""
-        invalid_emails = [
+    @pytest.mark.parametrize(
+        "email",
+        [
             "not-an-email",
             "@example.com",
             "user@",
             "user @example.com",
             "user@example",
-        ]
-        for email in invalid_emails:
-            with pytest.raises(ValidationError, match="Invalid email"):
-                EmailValidator.validate_email(email)
+        ],
+    )
+    def test_validate_email_invalid(self, email):
+        """Test rejecting invalid email addresses."""
+        with pytest.raises(ValidationError, match="Invalid email"):
+            EmailValidator.validate_email(email)
     
     def test_validate_email_empty(self):
         """Test rejecting empty email."""
@@ -167,26 +279,48 @@ class TestEmailValidator:
         with pytest.raises(ValidationError, match="too long"):
             EmailValidator.validate_email(long_email)
     
+    def test_validate_email_too_long_checked_first(self):
+        """Test length is reported before format problems."""
+        with pytest.raises(ValidationError, match="too long"):
+            EmailValidator.validate_email("not an email " * 30)
+    
     def test_validate_email_strips_whitespace(self):
         """Test that validation strips whitespace."""
         result = EmailValidator.validate_email("  user@example.com  ")
         assert result == "user@example.com"
+    
+    def test_validate_emails(self):
+        """Test bulk validation yields stripped addresses lazily."""
+        results = EmailValidator.validate_emails(
+            ["user@example.com", " other@example.org ", "not-an-email"]
+        )
+        
+        assert next(results) == "user@example.com"
+        assert next(results) == "other@example.org"
+        with pytest.raises(ValidationError, match="Invalid email"):
+            next(results)
+    
+    def test_validate_emails_empty_entry(self):
+        """Test bulk validation reports empty entries like validate_email."""
+        with pytest.raises(ValidationError, match="cannot be empty"):
+            list(EmailValidator.validate_emails(["user@example.com", ""]))
 
 
 class TestGmailValidator:
     """Test Gmail-specific validation."""
     
-    def test_validate_label_valid(self):
-        """Test validating valid Gmail labels."""
-        valid_labels = [
+    @pytest.mark.parametrize(
+        "label",
+        [
             "Inbox",
             "Work/Projects",
             "Client: ABC Corp",
             "Label with spaces",
-        ]
-        for label in valid_labels:
-            result = GmailValidator.validate_label(label)
-            assert result == label
+        ],
+    )
+    def test_validate_label_valid(self, label):
+        """Test validating valid Gmail labels."""
+        assert GmailValidator.validate_label(label) == label
     
     def test_validate_label_empty(self):
         """Test rejecting empty label."""
@@ -200,6 +334,9 @@ class TestGmailValidator:
         
         with pytest.raises(ValidationError, match="invalid characters"):
             GmailValidator.validate_label("Label\nWithNewline")
+        
+        with pytest.raises(ValidationError, match="invalid characters"):
+            GmailValidator.validate_label("Label\x1bWithEscape")
     
     def test_validate_label_too_long(self):
         """Test rejecting too long label."""
@@ -207,18 +344,19 @@ class TestGmailValidator:
         with pytest.raises(ValidationError, match="too long"):
             GmailValidator.validate_label(long_label)
     
-    def test_validate_query_valid(self):
-        """Test validating valid Gmail queries."""
-        valid_queries = [
+    @pytest.mark.parametrize(
+        "query",
+        [
             "from:user@example.com",
             "subject:important",
             "has:attachment",
             'subject:"exact phrase"',
             "from:user@example.com subject:test",
-        ]
-        for query in valid_queries:
-            result = GmailValidator.validate_query(query)
-            assert result == query
+        ],
+    )
+    def test_validate_query_valid(self, query):
+        """Test validating valid Gmail queries."""
+        assert GmailValidator.validate_query(query) == query
     
     def test_validate_query_empty(self):
         """Test that empty query is valid."""
@@ -240,6 +378,12 @@ class TestGmailValidator:
         long_query = "a" * 15000
         with pytest.raises(ValidationError, match="too long"):
             GmailValidator.validate_query(long_query)
+    
+    def test_validate_query_too_long_checked_first(self):
+        """Test length is reported before content problems."""
+        long_query = 'subject:"' + "a" * 15000
+        with pytest.raises(ValidationError, match="too long"):
+            GmailValidator.validate_query(long_query)
 
 
 class TestDateValidator:
@@ -259,6 +403,16 @@ class TestDateValidator:
         assert start is None
         assert end is None
     
+    def test_validate_date_range_open_ended(self):
+        """Test validating a range with only one bound."""
+        start, end = DateValidator.validate_date_range("2024-01-01", None)
+        assert start == datetime(2024, 1, 1)
+        assert end is None
+        
+        start, end = DateValidator.validate_date_range("", "2024-12-31")
+        assert start is None
+        assert end == datetime(2024, 12, 31)
+    
     def test_validate_date_range_invalid_format(self):
         """Test rejecting invalid date format."""
         with pytest.raises(ValidationError, match="Invalid start date"):
@@ -301,32 +455,23 @@ class TestSizeValidator:
         with pytest.raises(ValidationError, match="must be an integer"):
             SizeValidator.validate_size_limit("not a number")
     
-    def test_parse_size_string_bytes(self):
-        """Test parsing size string in bytes."""
-        assert SizeValidator.parse_size_string("100B") == 100
-        assert SizeValidator.parse_size_string("100") == 100
-    
-    def test_parse_size_string_kilobytes(self):
-        """Test parsing size string in kilobytes."""
-        assert SizeValidator.parse_size_string("1KB") == 1024
-        assert SizeValidator.parse_size_string("10KB") == 10 * 1024
-    
-    def test_parse_size_string_megabytes(self):
-        """Test parsing size string in megabytes."""
-        assert SizeValidator.parse_size_string("1MB") == 1024 * 1024
-        assert SizeValidator.parse_size_string("50MB") == 50 * 1024 * 1024
-    
-    def test_parse_size_string_gigabytes(self):
-        """Test parsing size string in gigabytes."""
-        assert SizeValidator.parse_size_string("1GB") == 1024 * 1024 * 1024
-    
-    def test_parse_size_string_with_decimal(self):
-        """Test parsing size string with decimal."""
-        assert SizeValidator.parse_size_string("1.5MB") == int(1.5 * 1024 * 1024)
-    
-    def test_parse_size_string_with_spaces(self):
-        """Test parsing size string with spaces."""
-        assert SizeValidator.parse_size_string("10 MB") == 10 * 1024 * 1024
+    @pytest.mark.parametrize(
+        "size_str,expected",
+        [
+            ("100B", 100),
+            ("100", 100),
+            ("1KB", 1024),
+            ("10KB", 10 * 1024),
+            ("1MB", 1024 * 1024),
+            ("50MB", 50 * 1024 * 1024),
+            ("1GB", 1024 * 1024 * 1024),
+            ("1.5MB", int(1.5 * 1024 * 1024)),  # Decimal
+            ("10 MB", 10 * 1024 * 1024),  # Space before unit
+        ],
+    )
+    def test_parse_size_string(self, size_str, expected):
+        """Test parsing size strings with each unit."""
+        assert SizeValidator.parse_size_string(size_str) == expected
     
     def test_parse_size_string_invalid(self):
         """Test rejecting invalid size string."""